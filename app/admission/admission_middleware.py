@@ -0,0 +1,70 @@
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+import logging
+
+from app.config import settings
+from app.oath import get_token_subject
+from app.admission.limiter import ConcurrencyLimiter, TokenBucket
+
+
+def write_limiter() -> ConcurrencyLimiter:
+    return ConcurrencyLimiter(
+        settings.WRITE_CONCURRENCY,
+        settings.WRITE_QUEUE_SIZE,
+        settings.ADMISSION_QUEUE_TIMEOUT,
+    )
+
+
+# expensive routes get their own small pool so a burst on one of them
+# can't take the mongo pool or the cpu away from the cheap reads. Their
+# handlers are plain def so the work runs in the threadpool, not on the loop
+ROUTE_LIMITERS = {
+    "/api/book/admin/add": write_limiter(),
+    "/api/auth/login": write_limiter(),
+    "/api/auth/register": write_limiter(),
+}
+
+# every other route shares the larger read pool
+read_limiter = ConcurrencyLimiter(
+    settings.READ_CONCURRENCY,
+    settings.READ_QUEUE_SIZE,
+    settings.ADMISSION_QUEUE_TIMEOUT,
+)
+
+user_buckets = TokenBucket(settings.RATE_LIMIT_PER_SECOND, settings.RATE_LIMIT_BURST)
+
+
+def rate_limit_key(request) -> str:
+    # key on the jwt subject, fall back to the client address for anonymous calls
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        subject = get_token_subject(token)
+        if subject:
+            return "user:" + subject
+    host = request.client.host if request.client else "unknown"
+    return "ip:" + host
+
+
+class AdmissionMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        if not user_buckets.allow(rate_limit_key(request)):
+            logging.error("Rate limit exceeded!!!")
+            return JSONResponse(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                content={"detail": "Too many requests!!!"},
+                headers={"Retry-After": "1"},
+            )
+
+        limiter = ROUTE_LIMITERS.get(request.url.path, read_limiter)
+        if not await limiter.acquire():
+            logging.error("Server busy, request rejected!!!")
+            return JSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={"detail": "Server is busy. Please try again later."},
+                headers={"Retry-After": "1"},
+            )
+        try:
+            return await call_next(request)
+        finally:
+            limiter.release()
@@ -0,0 +1,69 @@
+from collections import OrderedDict
+import asyncio
+import time
+
+
+class ConcurrencyLimiter:
+    """Semaphore with a bounded waiting queue.
+
+    Requests over the limit wait in the queue for at most `timeout` seconds;
+    once the queue is full new requests are rejected straight away.
+    """
+
+    def __init__(self, limit: int, queue_size: int, timeout: float) -> None:
+        self.semaphore = asyncio.Semaphore(limit)
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.waiting = 0
+
+    async def acquire(self) -> bool:
+        # take a free slot without yielding, otherwise a burst arriving in
+        # the same loop turn would all get past the queue check below
+        if not self.semaphore.locked():
+            await self.semaphore.acquire()
+            return True
+        # fast fail when every slot is busy and the queue is already full
+        if self.waiting >= self.queue_size:
+            return False
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), self.timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self.waiting -= 1
+
+    def release(self) -> None:
+        self.semaphore.release()
+
+
+class TokenBucket:
+    """Token buckets keyed on the user, refilled at `rate` tokens per second.
+
+    At most `max_keys` buckets are kept, the least recently used one is
+    dropped when a new key comes in.
+    """
+
+    def __init__(self, rate: float, burst: int, max_keys: int = 10000) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def allow(self, key: str) -> bool:
+        now = time.monotonic()
+        bucket = self.buckets.pop(key, None)
+        if bucket is None:
+            tokens = self.burst
+            if len(self.buckets) >= self.max_keys:
+                self.buckets.popitem(last=False)
+        else:
+            tokens, last = bucket
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        # re-inserting moves the key to the most recently used end
+        self.buckets[key] = (tokens, now)
+        return allowed
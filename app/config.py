@@ -1,4 +1,9 @@
+from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings
+
+READ_PREFERENCE_MODES = {"primary", "primaryPreferred", "secondary", "secondaryPreferred", "nearest"}
+CATALOG_READS = {"all", "search", "personalize"}
+
 class Settings(BaseSettings):
     DB_URL: str
     MONGODB_DATABASE: str
@@ -8,6 +13,63 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRES_IN: int
     ACCESS_TOKEN_EXPIRES_IN: int
     CLIENT_ORIGIN: str
+
+    # admission control: concurrent requests allowed and waiting queue size
+    # for cheap reads and for expensive writes (bulk add, login, register)
+    READ_CONCURRENCY: int = 64
+    READ_QUEUE_SIZE: int = 128
+    WRITE_CONCURRENCY: int = 4
+    WRITE_QUEUE_SIZE: int = 8
+    # seconds a request may wait in the queue before getting a 503
+    ADMISSION_QUEUE_TIMEOUT: float = 2.0
+    # per user token bucket: refill rate (requests/sec) and burst size
+    RATE_LIMIT_PER_SECOND: float = 10.0
+    RATE_LIMIT_BURST: int = 20
+
+    # read preference for catalog and recommendation reads, one of primary,
+    # primaryPreferred, secondary, secondaryPreferred or nearest
+    CATALOG_READ_PREFERENCE: str = "secondaryPreferred"
+    # how far behind the primary a secondary may be, -1 for no bound (min 90)
+    READ_MAX_STALENESS_SECONDS: int = 90
+    # override of the catalog read preference for all, search or personalize, eg
+    # READ_PREFERENCE_OVERRIDES={"search": "nearest"}
+    READ_PREFERENCE_OVERRIDES: dict[str, str] = {}
+
+    # profiling, off by default and switched on at runtime by an admin
+    PROFILE_ENABLED: bool = False
+    # fraction of requests to profile, admin requests with the X-Profile header are always profiled
+    PROFILE_SAMPLE_RATE: float = Field(0.0, ge=0, le=1)
+    PROFILE_SAMPLE_INTERVAL_MS: float = Field(5.0, gt=0)
+    # mongo commands slower than this are recorded
+    PROFILE_SLOW_QUERY_MS: float = Field(100.0, ge=0)
+    # number of profiles and slow queries kept in memory
+    PROFILE_BUFFER_SIZE: int = Field(200, gt=0)
+
+    @field_validator("READ_MAX_STALENESS_SECONDS")
+    @classmethod
+    def check_max_staleness(cls, value: int) -> int:
+        # mongodb rejects a staleness bound under 90 seconds at server selection
+        if value != -1 and value < 90:
+            raise ValueError("READ_MAX_STALENESS_SECONDS must be -1 or at least 90")
+        return value
+
+    @field_validator("CATALOG_READ_PREFERENCE")
+    @classmethod
+    def check_read_preference(cls, value: str) -> str:
+        if value not in READ_PREFERENCE_MODES:
+            raise ValueError("Unknown read preference: " + value)
+        return value
+
+    @field_validator("READ_PREFERENCE_OVERRIDES")
+    @classmethod
+    def check_read_preference_overrides(cls, value: dict[str, str]) -> dict[str, str]:
+        for name, mode in value.items():
+            if name not in CATALOG_READS:
+                raise ValueError("Unknown catalog read: " + name)
+            if mode not in READ_PREFERENCE_MODES:
+                raise ValueError("Unknown read preference: " + mode)
+        return value
+
     class Config:
         env_file = './.env'
 
@@ -1,11 +1,17 @@
 from pymongo import mongo_client
+from pymongo import read_preferences
 import pymongo
 import logging
 
 from app.config import settings
+from app.profiler.profiler import slow_query_listener
 
 def connect_db():
-    client = mongo_client.MongoClient(settings.DB_URL, serverSelectionTimeoutMS=5000)
+    client = mongo_client.MongoClient(
+        settings.DB_URL,
+        serverSelectionTimeoutMS=5000,
+        event_listeners=[slow_query_listener],
+    )
     try:
         conn = client.server_info()
         logging.info(f'Connected to MongoDB {conn.get("version")}')
@@ -14,6 +20,23 @@ def connect_db():
     return client
 
 
+READ_PREFERENCES = {
+    "primaryPreferred": read_preferences.PrimaryPreferred,
+    "secondary": read_preferences.Secondary,
+    "secondaryPreferred": read_preferences.SecondaryPreferred,
+    "nearest": read_preferences.Nearest,
+}
+
+
+# read preference for a catalog read (all, search or personalize),
+# borrow/return and auth stay on the primary
+def catalog_read_preference(name: str):
+    mode = settings.READ_PREFERENCE_OVERRIDES.get(name, settings.CATALOG_READ_PREFERENCE)
+    if mode == "primary":
+        return read_preferences.Primary()
+    return READ_PREFERENCES[mode](max_staleness=settings.READ_MAX_STALENESS_SECONDS)
+
+
 # fucntion to close connection with mongodb
 def close_connection(client):
     if not client:
@@ -1,15 +1,18 @@
 from starlette.middleware.base import BaseHTTPMiddleware
+import time
 from app.logger.logger import logger
 
 
 class LogMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request, call_next):
+        start = time.perf_counter()
         response = await call_next(request)
+        duration_ms = (time.perf_counter() - start) * 1000
         logger.info(
             "Incoming request",
             extra={
                 "req": { "method": request.method, "url": str(request.url) },
-                "res": { "status_code": response.status_code, },
+                "res": { "status_code": response.status_code, "duration_ms": round(duration_ms, 2), },
             },
         )
         return response
\ No newline at end of file
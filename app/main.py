@@ -2,11 +2,16 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
-from app.router import auth,book_admin,book_user
+from app.router import auth,book_admin,book_user,profile_admin
 from app.logger.log_middleware import LogMiddleware
+from app.admission.admission_middleware import AdmissionMiddleware
+from app.profiler.profile_middleware import ProfileMiddleware
 
 
 app = FastAPI()
+app.add_middleware(ProfileMiddleware)
+# admission runs inside the log middleware so rejected requests are logged too
+app.add_middleware(AdmissionMiddleware)
 app.add_middleware(LogMiddleware)
 
 origins = [
@@ -25,6 +30,7 @@ app.add_middleware(
 app.include_router(auth.router, tags=['Auth'], prefix='/api/auth')
 app.include_router(book_admin.router, tags=['Auth'], prefix='/api/book/admin')
 app.include_router(book_user.router, tags=['Auth'], prefix='/api/book/user')
+app.include_router(profile_admin.router, tags=['Profile'], prefix='/api/admin/profile')
 
 
 @app.get("/api/status")
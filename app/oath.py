@@ -43,21 +43,25 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     return jwt_token
 
 
+def get_token_subject(token: str) -> str | None:
+    # decode the token without hitting the db, None if it is not valid
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    return payload.get("sub")
+
+
 async def jwt_authenticate(token: Annotated[str, Depends(oauth2_scheme)]):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        # decode the token
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            logging.error("username is not valid in token!!!!!")
-            raise credentials_exception
-    except JWTError as e:
-        logging.error("Authentication failed!!!!\n", e)
+    # decode the token
+    username = get_token_subject(token)
+    if username is None:
+        logging.error("Authentication failed, username is not valid in token!!!!!")
         raise credentials_exception
     user = User.find_one({"email": username})
     if user is None:
@@ -0,0 +1,81 @@
+from datetime import datetime
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+import random
+import sys
+import threading
+import time
+
+from app.db import User
+from app.oath import get_token_subject
+from app.profiler.profiler import StackSampler, current_request, profiler, request_threads
+
+
+def is_admin(authorization: str) -> bool:
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    subject = get_token_subject(token)
+    if not subject:
+        return False
+    user = User.find_one({"email": subject}, {"role": 1})
+    return bool(user) and "admin" in user.get("role", [])
+
+
+class ProfileMiddleware:
+    """Plain ASGI middleware so requests pass straight through when disabled."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        # nothing to do unless an admin switched profiling on
+        if scope["type"] != "http" or not profiler.enabled:
+            return await self.app(scope, receive, send)
+
+        current_request.set(scope["method"] + " " + scope["path"])
+        if not await self.selected(scope) or not profiler.sampler_lock.acquire(blocking=False):
+            return await self.app(scope, receive, send)
+
+        status_code = None
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        # this frame is on the loop thread's stack whenever the request's task runs,
+        # plain def endpoints add their threadpool thread to the shared set
+        threads = set()
+        request_threads.set(threads)
+        sampler = StackSampler(
+            profiler.sample_interval_ms / 1000, sys._getframe(), threading.get_ident(), threads
+        )
+        started_at = datetime.utcnow()
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            result = sampler.stop()
+            profiler.sampler_lock.release()
+            profiler.profiles.append(
+                {
+                    "time": started_at,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status_code": status_code,
+                    "duration_ms": (time.perf_counter() - start) * 1000,
+                    **result,
+                }
+            )
+
+    async def selected(self, scope) -> bool:
+        if random.random() < profiler.sample_rate:
+            return True
+        # the X-Profile header is only honoured for admins
+        headers = Headers(scope=scope)
+        if "x-profile" not in headers:
+            return False
+        return await run_in_threadpool(is_admin, headers.get("authorization", ""))
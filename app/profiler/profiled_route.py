@@ -0,0 +1,32 @@
+from fastapi.routing import APIRoute
+import asyncio
+import functools
+import threading
+
+from app.profiler.profiler import request_threads
+
+
+def record_thread(endpoint):
+    # add the threadpool thread to the profiled request while the endpoint runs
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        threads = request_threads.get()
+        if threads is None:
+            return endpoint(*args, **kwargs)
+        thread_id = threading.get_ident()
+        threads.add(thread_id)
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            threads.discard(thread_id)
+
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """Route whose plain def endpoint can be sampled in the threadpool."""
+
+    def __init__(self, path: str, endpoint, **kwargs) -> None:
+        if not asyncio.iscoroutinefunction(endpoint):
+            endpoint = record_thread(endpoint)
+        super().__init__(path, endpoint, **kwargs)
@@ -0,0 +1,154 @@
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime
+from itertools import count
+from pymongo import monitoring
+import os
+import sys
+import threading
+
+from app.config import settings
+
+# commands that can be explained on demand to get the docs examined
+EXPLAINABLE_COMMANDS = {"find", "count", "aggregate", "distinct"}
+
+# method and path of the request being served, used to tag slow queries
+current_request: ContextVar[str | None] = ContextVar("current_request", default=None)
+
+# threadpool threads running the profiled request, set only while it is sampled
+request_threads: ContextVar[set | None] = ContextVar("request_threads", default=None)
+
+
+class ProfilerState:
+    """Runtime profiling settings and the ring buffers holding the results."""
+
+    def __init__(self) -> None:
+        self.enabled = settings.PROFILE_ENABLED
+        self.sample_rate = settings.PROFILE_SAMPLE_RATE
+        self.sample_interval_ms = settings.PROFILE_SAMPLE_INTERVAL_MS
+        self.slow_query_ms = settings.PROFILE_SLOW_QUERY_MS
+        self.profiles = deque(maxlen=settings.PROFILE_BUFFER_SIZE)
+        self.slow_queries = deque(maxlen=settings.PROFILE_BUFFER_SIZE)
+        # only one request is sampled at a time
+        self.sampler_lock = threading.Lock()
+
+    def clear(self) -> None:
+        self.profiles.clear()
+        self.slow_queries.clear()
+
+
+profiler = ProfilerState()
+
+
+class StackSampler(threading.Thread):
+    """Samples the call stacks of one request.
+
+    Stacks on the event loop thread are only counted while the request's own
+    task is running, found by its middleware frame. Plain def endpoints add
+    the threadpool thread running them to `request_threads`, whose stacks
+    are counted while they are in it.
+    """
+
+    def __init__(
+        self, interval: float, request_frame, loop_thread_id: int, request_threads: set
+    ) -> None:
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.request_frame = request_frame
+        self.loop_thread_id = loop_thread_id
+        self.request_threads = request_threads
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                on_loop = thread_id == self.loop_thread_id
+                if not on_loop and thread_id not in self.request_threads:
+                    continue
+                stack = []
+                in_request = not on_loop
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(
+                        f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+                    )
+                    if frame is self.request_frame:
+                        in_request = True
+                        break
+                    frame = frame.f_back
+                # the loop may be idle or running another request's task
+                if in_request:
+                    self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self) -> dict:
+        self.stopped.set()
+        self.join()
+        return {
+            "samples": sum(self.stacks.values()),
+            "stacks": [
+                {"stack": stack, "samples": samples}
+                for stack, samples in self.stacks.most_common(50)
+            ],
+        }
+
+
+class SlowQueryListener(monitoring.CommandListener):
+    """Records mongo commands slower than the configured threshold."""
+
+    def __init__(self) -> None:
+        self.pending = {}
+        self.ids = count(1)
+
+    def started(self, event) -> None:
+        if not profiler.enabled or event.command_name == "explain":
+            return
+        self.pending[(event.connection_id, event.request_id)] = (
+            event.command,
+            event.database_name,
+            current_request.get(),
+        )
+
+    def succeeded(self, event) -> None:
+        self.finish(event, event.reply)
+
+    def failed(self, event) -> None:
+        self.finish(event, None)
+
+    def finish(self, event, reply) -> None:
+        started = self.pending.pop((event.connection_id, event.request_id), None)
+        if started is None:
+            return
+        duration_ms = event.duration_micros / 1000
+        if duration_ms < profiler.slow_query_ms:
+            return
+        command, database, request = started
+        name = event.command_name
+        cursor = (reply or {}).get("cursor", {})
+        explain = None
+        if name in EXPLAINABLE_COMMANDS:
+            explain = {
+                key: value
+                for key, value in command.items()
+                if not key.startswith("$") and key not in ("lsid", "txnNumber")
+            }
+        profiler.slow_queries.append(
+            {
+                "id": next(self.ids),
+                "time": datetime.utcnow(),
+                "request": request,
+                "database": database,
+                "command": name,
+                "collection": command.get(name),
+                "filter": command.get("filter", command.get("query", command.get("pipeline"))),
+                "duration_ms": duration_ms,
+                "docs_returned": len(cursor.get("firstBatch", [])) if cursor else None,
+                "failed": reply is None,
+                # filled in by the explain endpoint, not measured on the original run
+                "docs_examined_estimate": None,
+                "explain": explain,
+            }
+        )
+
+
+slow_query_listener = SlowQueryListener()
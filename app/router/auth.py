@@ -9,20 +9,21 @@ from app.db import User
 import app.schema as schema
 from app.oath import create_access_token, verify_password, get_hashed_password
 from app.config import settings
+from app.profiler.profiled_route import ProfiledRoute
 
 
 # Set up a logger with basic configuration
 logging.basicConfig(level=logging.INFO)
 
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.post(
     "/register",
     status_code=status.HTTP_201_CREATED,
 )
-async def create_user(requestUser: schema.UserInDB):
+def create_user(requestUser: schema.UserInDB):
     # Check if user already exist
     user = User.find_one({"email": requestUser.email})
     if user:
@@ -7,18 +7,19 @@ from app.schema import UserSchema
 from app.db import Book
 import app.schema as schema
 from app.permission import PermissionChecker
+from app.profiler.profiled_route import ProfiledRoute
 
 # Set up a logger with basic configuration
 logging.basicConfig(level=logging.INFO)
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.post(
     "/add",
     status_code=status.HTTP_201_CREATED,
 )
-async def add_books(
+def add_books(
     requestBooks: List[schema.Book],
     current_user: UserSchema = Depends(PermissionChecker(required_roles=["admin"])),
 ):
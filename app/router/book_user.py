@@ -5,10 +5,19 @@ import logging
 from datetime import datetime
 
 import app.schema as schema
-from app.db import Book, IssuedBook
+from app.db import Book, IssuedBook, catalog_read_preference
 from app.permission import PermissionChecker
+from app.profiler.profiled_route import ProfiledRoute
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
+
+# catalog and recommendation reads may be served by secondaries,
+# borrow and return keep using the primary collections above
+AllBooks = Book.with_options(read_preference=catalog_read_preference("all"))
+SearchBooks = Book.with_options(read_preference=catalog_read_preference("search"))
+personalize_read_preference = catalog_read_preference("personalize")
+RecommendBooks = Book.with_options(read_preference=personalize_read_preference)
+IssueHistory = IssuedBook.with_options(read_preference=personalize_read_preference)
 
 # Set up a logger with basic configuration
 logging.basicConfig(level=logging.INFO)
@@ -22,7 +31,7 @@ async def get_all_books(
     skip = (page - 1) * page_size
 
     # fetch based on page number and page size
-    books = Book.find().skip(skip).limit(page_size)
+    books = AllBooks.find().skip(skip).limit(page_size)
 
     if not books:
         logging.error("No books found in the db!!!!")
@@ -46,7 +55,7 @@ async def search_book(
 
     # find books based on search query
     books = (
-        Book.find(
+        SearchBooks.find(
             {
                 "$or": [
                     {"title": query},
@@ -76,16 +85,21 @@ async def recommend_books(
     )
 ):
     # get user issued booked history
-    get_issue_history = IssuedBook.find({"user_id": current_user["email"]})
+    get_issue_history = IssueHistory.find({"user_id": current_user["email"]})
     user_interests = set()
 
     # add unique authors name for recommendations
     for record in get_issue_history:
-        book = Book.find_one({"isbn": record["book_id"]})
+        book = RecommendBooks.find_one({"isbn": record["book_id"]})
+        # the book may be deleted, or not yet replicated to the secondary
+        # that served this read while its issue record already was
+        if not book:
+            logging.error("Book not found for issued record: " + record["book_id"])
+            continue
         user_interests.add(book["author"])
 
     # search books based on identified interests
-    recommended_books = Book.find({"author": {"$in": list(user_interests)}}).limit(15)
+    recommended_books = RecommendBooks.find({"author": {"$in": list(user_interests)}}).limit(15)
     logging.info("Recommending books based on  interests..")
     return recommended_books
 
@@ -0,0 +1,116 @@
+from fastapi import APIRouter, status, Depends, HTTPException
+from bson import json_util
+from pymongo import read_preferences
+import json
+import logging
+
+from app.db import client
+import app.schema as schema
+from app.permission import PermissionChecker
+from app.profiler.profiler import profiler
+from app.profiler.profiled_route import ProfiledRoute
+
+# Set up a logger with basic configuration
+logging.basicConfig(level=logging.INFO)
+
+router = APIRouter(route_class=ProfiledRoute)
+
+
+def profile_settings() -> dict:
+    return {
+        "enabled": profiler.enabled,
+        "sample_rate": profiler.sample_rate,
+        "sample_interval_ms": profiler.sample_interval_ms,
+        "slow_query_ms": profiler.slow_query_ms,
+    }
+
+
+def docs_examined(explain: dict) -> int | None:
+    if "executionStats" in explain:
+        return explain["executionStats"].get("totalDocsExamined")
+    # aggregate explains keep the stats under the $cursor stage
+    total = None
+    for stage in explain.get("stages", []):
+        stats = stage.get("$cursor", {}).get("executionStats")
+        if stats:
+            total = (total or 0) + stats.get("totalDocsExamined", 0)
+    return total
+
+
+@router.get("/")
+async def get_profiles(
+    current_user: schema.UserSchema = Depends(PermissionChecker(required_roles=["admin"])),
+):
+    slow_queries = [
+        {key: value for key, value in query.items() if key != "explain"}
+        for query in list(profiler.slow_queries)
+    ]
+
+    # bson json_util handles ObjectId and regex values in the filters
+    return json.loads(
+        json_util.dumps(
+            {
+                "settings": profile_settings(),
+                "profiles": list(profiler.profiles),
+                "slow_queries": slow_queries,
+            }
+        )
+    )
+
+
+@router.get("/slow/{query_id}/explain")
+def explain_slow_query(
+    query_id: int,
+    current_user: schema.UserSchema = Depends(PermissionChecker(required_roles=["admin"])),
+):
+    query = next((query for query in list(profiler.slow_queries) if query["id"] == query_id), None)
+    if not query:
+        logging.error("Slow query not found!!!")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Slow query not found!!"
+        )
+    if not query["explain"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only find, count, aggregate and distinct can be explained!!",
+        )
+
+    # explained once, the estimate is kept with the slow query
+    if query["docs_examined_estimate"] is not None:
+        return {"id": query_id, "docs_examined_estimate": query["docs_examined_estimate"]}
+
+    # run the recorded command again with explain, on a secondary when there is one.
+    # It sees the data as it is now, so docs examined is an after the fact estimate
+    try:
+        result = client[query["database"]].command(
+            {"explain": query["explain"], "verbosity": "executionStats"},
+            read_preference=read_preferences.SecondaryPreferred(),
+        )
+    except Exception as e:
+        logging.error("Failed to explain query!!! " + str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to explain query!!",
+        )
+    query["docs_examined_estimate"] = docs_examined(result)
+    return {"id": query_id, "docs_examined_estimate": query["docs_examined_estimate"]}
+
+
+@router.put("/settings")
+async def update_profile_settings(
+    requestSettings: schema.ProfileSettings,
+    current_user: schema.UserSchema = Depends(PermissionChecker(required_roles=["admin"])),
+):
+    # only change the values sent in the request
+    for key, value in requestSettings.model_dump(exclude_none=True).items():
+        setattr(profiler, key, value)
+    logging.info("Profile settings updated.")
+    return profile_settings()
+
+
+@router.delete("/", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_profiles(
+    current_user: schema.UserSchema = Depends(PermissionChecker(required_roles=["admin"])),
+):
+    profiler.clear()
+    logging.info("Profiles cleared.")
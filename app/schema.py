@@ -1,5 +1,5 @@
 from datetime import datetime
-from pydantic import BaseModel, EmailStr, constr
+from pydantic import BaseModel, EmailStr, Field, constr
 
 
 class UserSchema(BaseModel):
@@ -51,3 +51,10 @@ class BookIssueResponse(BaseModel):
     user_id: str
     book_id: str
     borrow_date: datetime | None = None
+
+
+class ProfileSettings(BaseModel):
+    enabled: bool | None = None
+    sample_rate: float | None = Field(None, ge=0, le=1)
+    sample_interval_ms: float | None = Field(None, gt=0)
+    slow_query_ms: float | None = Field(None, ge=0)
@@ -0,0 +1,86 @@
+"""Measure /api/book/user/all latency with and without an admin bulk import.
+
+Run against a running server with an admin user:
+
+    python scripts/load_test.py --email admin@gmail.com --password test1234
+
+It first runs only readers, then readers while admins keep posting bulk
+imports to /api/book/admin/add, and prints p50/p99 for /all in both phases.
+All readers come from one address, so start the server with a high per user
+rate limit (RATE_LIMIT_PER_SECOND=100000 RATE_LIMIT_BURST=100000) to measure
+the concurrency limits rather than the 429s.
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+async def reader(client: httpx.AsyncClient, deadline: float, latencies: list, codes: dict):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.get("/api/book/user/all", params={"page": 1, "page_size": 20})
+        codes[response.status_code] = codes.get(response.status_code, 0) + 1
+        if response.status_code == 200:
+            latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def importer(client: httpx.AsyncClient, deadline: float, token: str, batch: int, codes: dict):
+    headers = {"Authorization": "bearer " + token}
+    while time.perf_counter() < deadline:
+        books = [
+            {"isbn": "load-" + uuid.uuid4().hex, "title": "Load test", "author": "Load test", "quantity": 1}
+            for _ in range(batch)
+        ]
+        response = await client.post("/api/book/admin/add", json=books, headers=headers)
+        codes[response.status_code] = codes.get(response.status_code, 0) + 1
+
+
+async def run_phase(client, args, token, with_import: bool):
+    latencies, read_codes, import_codes = [], {}, {}
+    deadline = time.perf_counter() + args.duration
+    tasks = [reader(client, deadline, latencies, read_codes) for _ in range(args.readers)]
+    if with_import:
+        tasks += [
+            importer(client, deadline, token, args.batch, import_codes)
+            for _ in range(args.importers)
+        ]
+    await asyncio.gather(*tasks)
+    name = "reads + import" if with_import else "reads only"
+    print(
+        f"{name:15} requests={len(latencies)} "
+        f"p50={percentile(latencies, 50):.1f}ms p99={percentile(latencies, 99):.1f}ms "
+        f"read codes={read_codes} import codes={import_codes}"
+    )
+
+
+async def main(args):
+    async with httpx.AsyncClient(base_url=args.url, timeout=30) as client:
+        response = await client.post(
+            "/api/auth/login", data={"username": args.email, "password": args.password}
+        )
+        response.raise_for_status()
+        token = response.json()["access_token"]
+        await run_phase(client, args, token, with_import=False)
+        await run_phase(client, args, token, with_import=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--readers", type=int, default=20)
+    parser.add_argument("--importers", type=int, default=8)
+    parser.add_argument("--batch", type=int, default=500)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,73 @@
+"""Show how a read heavy mix is spread over the replica set members.
+
+Start the replica set with a high rate limit, since all reads come from one
+address:
+
+    RATE_LIMIT_PER_SECOND=100000 RATE_LIMIT_BURST=100000 \
+        docker-compose -f docker-compose.replica.yml up
+
+then run:
+
+    python scripts/read_routing_check.py
+
+It reads the query counters of every member, sends catalog reads to the app
+and prints how many queries each member served. Run it once more after
+restarting the app with CATALOG_READ_PREFERENCE=primary to compare the
+load on the primary.
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from pymongo import MongoClient
+
+MEMBERS = ["localhost:27017", "localhost:27018", "localhost:27019"]
+
+
+def query_counters() -> dict[str, tuple[bool, int]]:
+    counters = {}
+    for member in MEMBERS:
+        client = MongoClient(member, directConnection=True, serverSelectionTimeoutMS=5000)
+        status = client.admin.command("serverStatus")
+        primary = client.admin.command("hello").get("isWritablePrimary", False)
+        ops = status["opcounters"]
+        counters[member] = (primary, ops["query"] + ops["getmore"])
+        client.close()
+    return counters
+
+
+async def reader(client: httpx.AsyncClient, deadline: float, counts: dict):
+    paths = [
+        ("/api/book/user/all", {"page": 1, "page_size": 20}),
+        ("/api/book/user/search", {"query": "Python Crash Course"}),
+    ]
+    i = 0
+    while time.perf_counter() < deadline:
+        path, params = paths[i % len(paths)]
+        response = await client.get(path, params=params)
+        counts[response.status_code] = counts.get(response.status_code, 0) + 1
+        i += 1
+
+
+async def main(args):
+    before = query_counters()
+    counts = {}
+    deadline = time.perf_counter() + args.duration
+    async with httpx.AsyncClient(base_url=args.url, timeout=30) as client:
+        await asyncio.gather(*[reader(client, deadline, counts) for _ in range(args.readers)])
+    after = query_counters()
+
+    print(f"requests: {counts}")
+    for member in MEMBERS:
+        primary, queries = after[member]
+        role = "primary" if primary else "secondary"
+        print(f"{member} ({role}): {queries - before[member][1]} queries")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--readers", type=int, default=10)
+    asyncio.run(main(parser.parse_args()))
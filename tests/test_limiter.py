@@ -0,0 +1,48 @@
+import asyncio
+import time
+
+from app.admission.limiter import ConcurrencyLimiter, TokenBucket
+
+
+def test_burst_over_queue_fails_fast():
+    async def burst():
+        limiter = ConcurrencyLimiter(limit=2, queue_size=2, timeout=0.3)
+        results = []
+
+        async def request():
+            start = time.perf_counter()
+            admitted = await limiter.acquire()
+            results.append((admitted, time.perf_counter() - start))
+
+        await asyncio.gather(*[request() for _ in range(20)])
+        return results
+
+    results = asyncio.run(burst())
+    admitted = [elapsed for ok, elapsed in results if ok]
+    rejected = [elapsed for ok, elapsed in results if not ok]
+    # two slots taken straight away, two wait in the queue and time out
+    assert len(admitted) == 2
+    assert len(rejected) == 18
+    # the other 16 are rejected without waiting for the timeout
+    assert sum(1 for elapsed in rejected if elapsed < 0.1) == 16
+
+
+def test_released_slot_goes_to_queued_request():
+    async def run():
+        limiter = ConcurrencyLimiter(limit=1, queue_size=1, timeout=1)
+        assert await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.waiting == 1
+        limiter.release()
+        return await waiter
+
+    assert asyncio.run(run())
+
+
+def test_token_bucket_keeps_max_keys():
+    buckets = TokenBucket(rate=1, burst=2, max_keys=100)
+    for key in range(1000):
+        buckets.allow(str(key))
+    assert len(buckets.buckets) == 100
+    assert [buckets.allow("user") for _ in range(3)] == [True, True, False]